@@ -0,0 +1,153 @@
+import operator
+import unittest
+
+import xdh.config as config
+from xdh import _columns
+
+
+def make(index):
+    return config.Dict({
+        'name': 'svc%d' % (index % 3),
+        'debug': index % 2 == 0,
+        'big': 2 ** 60 + index,
+        'db': {
+            'pool': {'size': index * 10},
+            'ratio': index / 4,
+            'host': None if index == 4 else 'h%d' % index,
+        },
+        'tags': ['a', {'x': index}],
+    })
+
+
+class IterFlatTest(unittest.TestCase):
+    def test_iter_flat(self):
+        self.assertEqual(list(make(1).iter_flat()), [
+            (('big', ), 2 ** 60 + 1),
+            (('db', 'host'), 'h1'),
+            (('db', 'pool', 'size'), 10),
+            (('db', 'ratio'), 0.25),
+            (('debug', ), False),
+            (('name', ), 'svc1'),
+            (('tags', 0), 'a'),
+            (('tags', 1, 'x'), 1),
+        ])
+
+    def test_shadowed_methods(self):
+        elem = config.Dict({
+            'order': {'items': [1, 2], 'keys': {'values': 'v'}},
+        })
+
+        self.assertEqual(list(elem.iter_flat()), [
+            (('order', 'items', 0), 1),
+            (('order', 'items', 1), 2),
+            (('order', 'keys', 'values'), 'v'),
+        ])
+        self.assertEqual(len(config.to_columns([elem])), 3)
+
+    def test_empty(self):
+        self.assertEqual(list(config.Dict({'a': {}}).iter_flat()), [])
+
+
+class ColumnTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = config.to_columns(make(index) for index in range(10))
+
+    def test_layout(self):
+        table = self.table
+
+        self.assertEqual(len(table), 80)
+        self.assertEqual(len(table.paths), 8)
+        self.assertEqual(
+            table.prefix(('db', )),
+            (('db', 'host'), ('db', 'pool', 'size'), ('db', 'ratio'))
+        )
+        self.assertEqual(table.prefix(('d', )), ())
+
+        rows = table.rows(('db', 'pool', 'size'))
+        self.assertEqual(set(table.kind[rows.start:rows.stop]), {_columns.INT})
+        self.assertEqual(
+            list(table.ints[rows.start:rows.stop]),
+            [index * 10 for index in range(10)]
+        )
+
+        rows = table.rows(('name', ))
+        codes = table.strings[rows.start:rows.stop]
+        self.assertEqual(
+            {table.dictionary[code] for code in codes},
+            {'svc0', 'svc1', 'svc2'}
+        )
+
+    def test_int_compare(self):
+        self.assertEqual(
+            self.table.compare(('db', 'pool', 'size'), operator.gt, 50),
+            [6, 7, 8, 9]
+        )
+
+    def test_bools_are_not_numbers(self):
+        self.assertEqual(self.table.compare(('debug', ), operator.gt, 0), [])
+        self.assertEqual(
+            self.table.compare(('debug', ), operator.eq, True),
+            [0, 2, 4, 6, 8]
+        )
+
+    def test_large_ints_exact(self):
+        self.assertEqual(
+            self.table.compare(('big', ), operator.ge, 2 ** 60 + 7),
+            [7, 8, 9]
+        )
+        self.assertEqual(
+            self.table.compare(('big', ), operator.eq, 2 ** 60 + 3),
+            [3]
+        )
+
+    def test_ints_beyond_int64(self):
+        table = config.to_columns([
+            config.Dict({'n': 2 ** 70}),
+            config.Dict({'n': 1}),
+        ])
+        rows = table.rows(('n', ))
+
+        self.assertEqual(
+            list(table.kind[rows.start:rows.stop]),
+            [_columns.OTHER, _columns.INT]
+        )
+        self.assertEqual(table.value[rows.start], 2 ** 70)
+        self.assertEqual(table.where(('n', ), lambda v: v > 2 ** 69), [0])
+
+    def test_float_compare(self):
+        self.assertEqual(
+            self.table.compare(('db', 'ratio'), operator.lt, 0.5),
+            [0, 1]
+        )
+
+    def test_string_compare(self):
+        self.assertEqual(
+            self.table.compare(('name', ), operator.eq, 'svc1'),
+            [1, 4, 7]
+        )
+        self.assertEqual(
+            self.table.compare(('db', 'host'), operator.ge, 'h8'),
+            [8, 9]
+        )
+
+    def test_prefix_filters(self):
+        self.assertEqual(
+            self.table.compare(('db', ), operator.gt, 80, prefix=True),
+            [9]
+        )
+        self.assertEqual(
+            self.table.where(('db', ), lambda v: v is None, prefix=True),
+            [4]
+        )
+
+    def test_other_kinds(self):
+        with self.assertRaises(TypeError):
+            self.table.compare(('db', 'host'), operator.eq, None)
+
+        self.assertEqual(
+            self.table.where(('db', 'host'), lambda v: v is None),
+            [4]
+        )
+
+    def test_missing_path(self):
+        self.assertEqual(self.table.compare(('nope', ), operator.eq, 1), [])
@@ -0,0 +1,67 @@
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Cumulative microseconds allowed for importing xdh._config, with bytecode
+# already cached. It takes about 1ms on CPython 3.11.
+BUDGET = 10000
+
+# Modules xdh._config used to import eagerly, and should not any more.
+DEFERRED = {'copy', 'gc', 'gzip', 'pickle'}
+
+
+def import_times(env):
+    "Imports xdh.config in a new interpreter, returning its importtime lines."
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import xdh.config'],
+        cwd=str(ROOT),
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_time, cumulative, name = line[len('import time:'):].split('|')
+
+            if self_time.strip().isdigit():
+                yield name.strip(), int(self_time), int(cumulative)
+
+
+class ImportTimeTest(unittest.TestCase):
+    def setUp(self):
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+
+        self.env = dict(os.environ)
+        self.env.pop('PYTHONDONTWRITEBYTECODE', None)
+        self.env['PYTHONPYCACHEPREFIX'] = cache.name
+        self.env['PYTHONPATH'] = str(ROOT)
+
+        # Warm the bytecode cache, so compiling is not measured.
+        list(import_times(self.env))
+
+    def test_budget(self):
+        cumulative = min(
+            times['xdh._config']
+            for times in (
+                {name: total for name, _, total in import_times(self.env)}
+                for _ in range(3)
+            )
+        )
+
+        self.assertLess(cumulative, BUDGET)
+
+    def test_deferred_imports(self):
+        names = {name for name, _, _ in import_times(self.env)}
+
+        self.assertIn('xdh._config', names)
+        self.assertFalse(names & DEFERRED, names & DEFERRED)
@@ -0,0 +1,88 @@
+import functools
+import sys
+import unittest
+
+import xdh.config as config
+from xdh import _config
+
+
+class MemoryReportTest(unittest.TestCase):
+    def test_total_is_sum_of_paths(self):
+        cfg = config.Dict({
+            'a': 1,
+            'db': {'host': 'x' * 1000, 'ports': [1, {'n': 2}]},
+        })
+        report = cfg.memory_report()
+
+        self.assertEqual(report.total, sum(report.paths.values()))
+        self.assertEqual(
+            set(report.paths),
+            {(), ('db', ), ('db', 'ports', 1)}
+        )
+        self.assertGreater(report.paths[('db', )], 1000)
+
+    def test_shared_subtree_counted_once(self):
+        shared = config.Dict({'blob': 'y' * 100000})
+        single = config.Dict({'a': shared}).memory_report()
+        double = config.Dict({'a': shared, 'b': shared}).memory_report()
+
+        self.assertIn(('a', ), double.paths)
+        self.assertNotIn(('b', ), double.paths)
+        self.assertEqual(double.paths[('a', )], single.paths[('a', )])
+        self.assertLess(double.total, single.total + 100000)
+
+    def test_nothing_loaded(self):
+        cfg = config.Dict({})
+        cfg._reset_attr('lazy', functools.partial(_config.parse_element, 1))
+        cfg.memory_report()
+
+        self.assertIs(vars(cfg)['lazy'], _config.NotLoaded)
+
+    def test_closure_and_defaults_counted(self):
+        big = list(range(100000))
+        base = config.Dict({}).memory_report().total
+
+        closure = config.Dict({})
+        closure._reset_attr('x', lambda: big)
+
+        defaults = config.Dict({})
+        defaults._reset_attr('x', lambda big=big: big)
+
+        for cfg in (closure, defaults):
+            with self.subTest(cfg=cfg):
+                self.assertGreater(
+                    cfg.memory_report().total - base,
+                    sys.getsizeof(big)
+                )
+
+    def test_importable_functions_left_out(self):
+        cfg = config.Dict({})
+        cfg._reset_attr('x', functools.partial(_config.parse_element, None))
+        before = cfg.memory_report().total
+
+        cfg._reset_attr('x', functools.partial(_config.unpack_element, None))
+
+        self.assertEqual(cfg.memory_report().total, before)
+
+    def test_shared_constants_left_out(self):
+        shared = config.Dict({'a': None, 'b': True, 'c': 7, 'd': 'd'})
+        owned = config.Dict({
+            'a': 10 ** 6,
+            'b': 2 ** 40,
+            'c': 3 ** 30,
+            'd': 'not an identifier',
+        })
+
+        self.assertEqual(
+            owned.memory_report().total - shared.memory_report().total,
+            sum(sys.getsizeof(value) for value in owned.values())
+        )
+
+    def test_shared_constant(self):
+        for value in (None, True, False, 0, -5, 256, 'items', '__slots__'):
+            with self.subTest(value=value):
+                self.assertTrue(_config.shared_constant(value))
+
+        for value in (257, -6, 1.0, 'a b', ''.join(['not', '_interned'])):
+            with self.subTest(value=value):
+                self.assertFalse(_config.shared_constant(value))
@@ -0,0 +1,120 @@
+import functools
+import pickle
+import unittest
+
+import xdh.config as config
+from xdh import _config
+
+
+SOURCE = {
+    'name': 'app',
+    'blob': b'\x00\x01',
+    'db': {'host': 'localhost', 'ports': [5432, 5433]},
+    'tags': {'a', 'b'},
+}
+
+PROTOCOLS = range(pickle.HIGHEST_PROTOCOL + 1)
+
+
+def raw(elem):
+    "Returns a config object's contents without loading anything."
+
+    return dict(vars(elem))
+
+
+class PickleTest(unittest.TestCase):
+    def test_round_trip(self):
+        cfg = config.Dict(SOURCE)
+
+        for protocol in PROTOCOLS:
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertEqual(ret, cfg)
+                self.assertIsInstance(ret, _config.DictConfig)
+                self.assertEqual(ret.db.ports, (5432, 5433))
+                self.assertEqual(ret.tags, frozenset({'a', 'b'}))
+
+    def test_shared_nodes(self):
+        shared = config.Dict({'x': 1})
+
+        for protocol in PROTOCOLS:
+            with self.subTest(protocol=protocol):
+                first, second = pickle.loads(
+                    pickle.dumps((shared, shared), protocol)
+                )
+
+                self.assertIs(first, second)
+
+    def test_main_config(self):
+        ret = pickle.loads(pickle.dumps(config))
+
+        self.assertIs(ret.Dict, _config.DictConfig)
+        self.assertIs(ret.to_config, _config.parse_element)
+
+    def test_lazy_loader_stays_lazy(self):
+        cfg = config.Dict({'a': 1})
+        cfg._reset_attr(
+            'lazy',
+            functools.partial(_config.parse_element, {'q': 3}),
+            doc='Lazy.'
+        )
+
+        for protocol in PROTOCOLS:
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertIs(raw(ret)['lazy'], _config.NotLoaded)
+                self.assertEqual(type(ret).lazy.__doc__, 'Lazy.')
+                self.assertEqual(ret.lazy.q, 3)
+
+        self.assertIs(raw(cfg)['lazy'], _config.NotLoaded)
+
+    def test_unpicklable_loader_is_loaded(self):
+        cfg = config.Dict({'a': 1})
+        cfg._reset_attr('lam', lambda: {'q': 4})
+
+        for protocol in PROTOCOLS:
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertEqual(raw(ret)['lam'], {'q': 4})
+
+    def test_picklable_check_does_not_serialize(self):
+        picklable = _config.BaseConfig._picklable_
+
+        self.assertTrue(picklable(
+            functools.partial(_config.parse_element, object())
+        ))
+        self.assertTrue(picklable(_config.BaseConfig._simple_get_))
+        self.assertFalse(picklable(lambda: None))
+        self.assertFalse(picklable(functools.partial(lambda x: x, 1)))
+        self.assertFalse(picklable(
+            functools.partial(_config.parse_element, lambda: 1)
+        ))
+        self.assertFalse(picklable(functools.partial(
+            functools.partial,
+            _config.parse_element,
+            elem=lambda: 1
+        )))
+
+    def test_bound_unpicklable_callable_is_loaded(self):
+        cfg = config.Dict({'a': 1})
+        cfg._reset_attr('x', functools.partial(_config.parse_element, min))
+        cfg._reset_attr(
+            'y',
+            functools.partial(functools.reduce, lambda a, b: a + b, [1, 2])
+        )
+        cfg._reset_attr(
+            'z',
+            functools.partial(sorted, [1, 2], key=lambda v: -v)
+        )
+
+        for protocol in PROTOCOLS:
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertIs(raw(ret)['x'], _config.NotLoaded)
+                self.assertIs(ret.x, min)
+                self.assertEqual(raw(ret)['y'], 3)
+                self.assertEqual(raw(ret)['z'], [2, 1])
@@ -0,0 +1,227 @@
+import datetime
+import enum
+import pickle
+import unittest
+
+import xdh.config as config
+from xdh import _config, _schema
+
+
+class Mode(enum.Enum):
+    FAST = 'fast'
+    SLOW = 'slow'
+
+
+def lookup(value):
+    return {'a': 1}[value]
+
+
+SPEC = {
+    'db': {
+        'host': str,
+        'port': int,
+        'timeout': datetime.timedelta,
+        'pool': {'size': int},
+    },
+    'mode': Mode,
+    'ratio': float,
+    'debug': config.Field(bool, default=False, doc='Debug flag.'),
+    'tags': [str],
+    'extra': config.Field({'x': int}, lazy=True),
+}
+
+SOURCE = {
+    'db': {
+        'host': 'localhost',
+        'port': '5432',
+        'timeout': '1m30s',
+        'pool': {'size': 10.0},
+    },
+    'mode': 'FAST',
+    'ratio': '0.5',
+    'tags': ['a', 'b'],
+    'extra': {'x': '3'},
+}
+
+
+class CoerceTest(unittest.TestCase):
+    def test_bool(self):
+        for value, expected in [
+            (True, True), (0, False), (' Yes', True), ('off', False),
+        ]:
+            self.assertIs(_schema.coerce_bool(value), expected)
+
+        for value in (2, 'maybe', None):
+            with self.assertRaises(ValueError):
+                _schema.coerce_bool(value)
+
+    def test_int(self):
+        self.assertEqual(_schema.coerce_int(' 42 '), 42)
+        self.assertEqual(_schema.coerce_int(3.0), 3)
+
+        for value in (True, 3.5, 'x', None, '1_000', '١٢', '+5', '0022'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _schema.coerce_int(value)
+
+    def test_float(self):
+        self.assertEqual(_schema.coerce_float('2.5'), 2.5)
+        self.assertEqual(_schema.coerce_float(2), 2.0)
+
+        self.assertEqual(_schema.coerce_float(' -1e3 '), -1000.0)
+        self.assertEqual(_schema.coerce_float('7'), 7.0)
+
+        for value in (False, 'nan', 'inf', '-Infinity', '1_000.5', '١.٥'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _schema.coerce_float(value)
+
+    def test_str(self):
+        self.assertEqual(_schema.coerce_str('x'), 'x')
+
+        with self.assertRaises(TypeError):
+            _schema.coerce_str(1)
+
+    def test_timedelta(self):
+        td = datetime.timedelta
+
+        self.assertEqual(_schema.coerce_timedelta('1h30m'), td(minutes=90))
+        self.assertEqual(
+            _schema.coerce_timedelta('250ms'),
+            td(milliseconds=250)
+        )
+        self.assertEqual(_schema.coerce_timedelta(2), td(seconds=2))
+        self.assertEqual(_schema.coerce_timedelta('1.5'), td(seconds=1.5))
+
+        for value in ('soon', True, 'inf', 'nan', '1_0'):
+            with self.assertRaises(ValueError):
+                _schema.coerce_timedelta(value)
+
+    def test_enum(self):
+        self.assertIs(_schema.coerce_enum(Mode, 'slow'), Mode.SLOW)
+        self.assertIs(_schema.coerce_enum(Mode, 'SLOW'), Mode.SLOW)
+        self.assertIs(_schema.coerce_enum(Mode, Mode.FAST), Mode.FAST)
+
+        with self.assertRaises(ValueError):
+            _schema.coerce_enum(Mode, 'nope')
+
+    def test_bad_kind(self):
+        with self.assertRaisesRegex(TypeError, 'Cannot use'):
+            config.Schema({'a': [int, str]})
+
+        with self.assertRaisesRegex(TypeError, 'Cannot use'):
+            config.Schema({'a': 1})
+
+
+class SchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.schema = config.Schema(SPEC, 'AppConfig')
+
+    def test_load(self):
+        cfg = self.schema.load(SOURCE)
+
+        self.assertEqual(cfg.db.port, 5432)
+        self.assertEqual(cfg.db.pool.size, 10)
+        self.assertEqual(cfg.db.timeout, datetime.timedelta(seconds=90))
+        self.assertIs(cfg.mode, Mode.FAST)
+        self.assertEqual(cfg.ratio, 0.5)
+        self.assertIs(cfg.debug, False)
+        self.assertEqual(cfg.tags, ('a', 'b'))
+        self.assertEqual(type(cfg).debug.__doc__, 'Debug flag.')
+
+    def test_every_error_reported(self):
+        with self.assertRaises(config.SchemaError) as ctx:
+            self.schema.load({
+                'db': {'host': 1, 'port': 'x', 'pool': {}},
+                'mode': 'nope',
+                'ratio': 'half',
+                'tags': 'ab',
+                'zzz': 1,
+            })
+
+        self.assertEqual(
+            {path for path, message in ctx.exception.errors},
+            {
+                ('db', 'host'),
+                ('db', 'port'),
+                ('db', 'timeout'),
+                ('db', 'pool', 'size'),
+                ('mode', ),
+                ('ratio', ),
+                ('tags', ),
+                ('extra', ),
+                ('zzz', ),
+            }
+        )
+
+    def test_other_exceptions_collected(self):
+        schema = config.Schema({'a': lookup, 'b': int, 'c': [int]})
+
+        with self.assertRaises(config.SchemaError) as ctx:
+            schema.load({'a': 'missing', 'b': 'x', 'c': [1, 'y']})
+
+        self.assertEqual(
+            [path for path, message in ctx.exception.errors],
+            [('a', ), ('b', ), ('c', 1)]
+        )
+        self.assertIn('KeyError', ctx.exception.errors[0][1])
+
+    def test_lazy_field(self):
+        cfg = self.schema.load(dict(SOURCE, extra={'x': 'bad'}))
+
+        self.assertIs(vars(cfg)['extra'], _config.NotLoaded)
+
+        with self.assertRaises(config.SchemaError) as ctx:
+            cfg.extra
+
+        self.assertEqual(ctx.exception.errors[0][0], ('extra', 'x'))
+
+        cfg = self.schema.load(SOURCE)
+        self.assertEqual(cfg.extra.x, 3)
+
+    def test_plan_reused(self):
+        first = self.schema.load(SOURCE)
+        second = self.schema.load(SOURCE)
+
+        self.assertIs(type(first), type(second))
+        self.assertIs(type(first.db), type(second.db))
+        self.assertIs(config.Schema(SPEC, 'AppConfig'), self.schema)
+
+    def test_equal_defaults_of_other_types(self):
+        for first, second in [
+            ((1, ), (True, )),
+            ({'k': 1}, {'k': True}),
+            ({'k': (0, )}, {'k': (0.0, )}),
+            (frozenset({1}), frozenset({True})),
+            (0.0, -0.0),
+        ]:
+            with self.subTest(first=first, second=second):
+                schemas = [
+                    config.Schema({'t': config.Field(
+                        object,
+                        default=default
+                    )}, 'Defaults')
+                    for default in (first, second)
+                ]
+
+                self.assertIsNot(schemas[0], schemas[1])
+                self.assertEqual(
+                    repr(schemas[1].load({}).t),
+                    repr(_config.parse_element(second))
+                )
+
+    def test_pickle_keeps_plan(self):
+        cfg = self.schema.load(SOURCE)
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertIs(type(ret), type(cfg))
+                self.assertEqual(ret, cfg)
+                self.assertEqual(ret.extra.x, 3)
+
+    def test_error_pickles(self):
+        error = config.SchemaError([(('a', ), 'missing field')])
+
+        ret = pickle.loads(pickle.dumps(error))
+
+        self.assertEqual(ret.errors, error.errors)
@@ -0,0 +1,211 @@
+import pickle
+import unittest
+
+import xdh.config as config
+from xdh import _config, _sources
+
+
+class CoerceScalarTest(unittest.TestCase):
+    def test_converted(self):
+        for value, expected in [
+            ('true', True),
+            ('FALSE', False),
+            ('0', 0),
+            ('-12', -12),
+            ('1.5', 1.5),
+            ('-0.25', -0.25),
+            ('1e3', 1000.0),
+            ('2.5E-2', 0.025),
+        ]:
+            with self.subTest(value=value):
+                ret = _sources.coerce_scalar(value)
+
+                self.assertEqual(ret, expected)
+                self.assertIs(type(ret), type(expected))
+
+    def test_kept_as_strings(self):
+        for value in (
+            '0022', '1_000', 'nan', 'inf', '-Infinity', ' 5', '5 ', '+5',
+            '1.', '.5', '0x10', '١٢', 'yes', '',
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(_sources.coerce_scalar(value), value)
+
+
+class FlatIndexTest(unittest.TestCase):
+    def children(self, names, prefix=''):
+        index = _sources.FlatIndex.from_items(
+            ((name, name) for name in names),
+            '__'
+        )
+
+        return list(index.children(prefix))
+
+    def test_names_sorting_between_branch_entries(self):
+        names = ['db', 'db0', 'db__a', 'db__b__c', 'db_x', 'dba', 'e']
+
+        self.assertEqual(self.children(names), [
+            ('db', None, 'db__'),
+            ('db0', 'db0', None),
+            ('db_x', 'db_x', None),
+            ('dba', 'dba', None),
+            ('e', 'e', None),
+        ])
+        self.assertEqual(self.children(names, 'db__'), [
+            ('a', 'db__a', None),
+            ('b', None, 'db__b__'),
+        ])
+        self.assertEqual(self.children(names, 'db__b__'), [
+            ('c', 'db__b__c', None),
+        ])
+
+    def test_bad_names_left_out(self):
+        self.assertEqual(
+            self.children([
+                'a0_____a', 'bad-name', '__x', 'ok', 'x____y', 'b_',
+                'b___c', 'd__e_', 'f_.g',
+            ]),
+            [('ok', 'ok', None)]
+        )
+
+    def test_reserved_names_left_out(self):
+        self.assertEqual(
+            self.children([
+                '_attr_func_', '_attr_data_', 'keys', 'a__items',
+                'iter_flat', 'b___private', '_c', 'ok',
+            ]),
+            [('ok', 'ok', None)]
+        )
+
+    def test_missing_prefix(self):
+        self.assertEqual(self.children(['a', 'b'], 'c__'), [])
+        self.assertEqual(self.children([]), [])
+
+    def test_pickle(self):
+        index = _sources.FlatIndex.from_items([('b', '2'), ('a', '1')], '__')
+        ret = pickle.loads(pickle.dumps(index))
+
+        self.assertEqual(ret.names, ('a', 'b'))
+        self.assertEqual(ret.values, ('1', '2'))
+        self.assertEqual(ret.delimiter, '__')
+
+
+class FromEnvironTest(unittest.TestCase):
+    ENVIRON = {
+        'APP__DB__POOL__SIZE': '10',
+        'APP__DB__HOST': 'localhost',
+        'APP__DB': 'shadowed',
+        'APP__UMASK': '0022',
+        'APP__DEBUG': 'true',
+        'APP__A0_____A': 'x',
+        'OTHER__X': '1',
+    }
+
+    def test_nested(self):
+        cfg = config.from_environ('APP', environ=self.ENVIRON)
+
+        self.assertEqual(set(cfg), {'db', 'umask', 'debug'})
+        self.assertEqual(cfg.db.pool.size, 10)
+        self.assertEqual(cfg.db.host, 'localhost')
+        self.assertEqual(cfg.umask, '0022')
+        self.assertIs(cfg.debug, True)
+
+    def test_lazy(self):
+        cfg = config.from_environ('APP', environ=self.ENVIRON)
+
+        self.assertIs(vars(cfg)['db'], _config.NotLoaded)
+        cfg.db
+
+        self.assertIs(vars(cfg.db)['host'], _config.NotLoaded)
+
+    def test_pickle_stays_lazy(self):
+        cfg = config.from_environ('APP', environ=self.ENVIRON)
+        cfg.debug
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertIs(vars(ret)['db'], _config.NotLoaded)
+                self.assertIs(vars(ret)['debug'], True)
+                self.assertEqual(ret.db.pool.size, 10)
+
+    def test_reserved_names_left_out(self):
+        cfg = config.from_environ('APP', environ={
+            'APP___ATTR_DATA_': '1',
+            'APP___ATTR_FUNC_': '1',
+            'APP__KEYS': '1',
+            'APP__DB__GET': '1',
+            'APP__DB__PORT': '5',
+        })
+
+        self.assertEqual(set(cfg), {'db'})
+        self.assertEqual(set(cfg.db), {'port'})
+        self.assertEqual(dict(cfg.db), {'port': 5})
+
+    def test_coerce(self):
+        cfg = config.from_environ('APP', environ=self.ENVIRON, coerce=str)
+
+        self.assertEqual(cfg.db.pool.size, '10')
+
+    def test_pickle_lambda_coerce(self):
+        cfg = config.from_environ(
+            'APP',
+            environ=self.ENVIRON,
+            coerce=lambda value: value.upper()
+        )
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                ret = pickle.loads(pickle.dumps(cfg, protocol))
+
+                self.assertEqual(vars(ret)['db'].host, 'LOCALHOST')
+                self.assertEqual(ret.db.pool.size, '10')
+                self.assertEqual(ret.debug, 'TRUE')
+
+
+class ArgvTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            list(_sources.parse_argv([
+                'positional',
+                '--db.pool.size=5',
+                '--verbose',
+                '--log-level=debug',
+                '--query=a=b',
+                '--empty=',
+                '--',
+                '--ignored=1',
+            ])),
+            [
+                ('db.pool.size', '5'),
+                ('verbose', 'true'),
+                ('log_level', 'debug'),
+                ('query', 'a=b'),
+                ('empty', ''),
+            ]
+        )
+
+    def test_from_argv(self):
+        cfg = config.from_argv([
+            '--db.pool.size=5',
+            '--db.pool.size=6',
+            '--db.Host=h',
+            '--verbose',
+        ])
+
+        self.assertEqual(cfg.db.pool.size, 6)
+        self.assertEqual(cfg.db.Host, 'h')
+        self.assertIs(cfg.verbose, True)
+
+    def test_reserved_names_left_out(self):
+        cfg = config.from_argv([
+            '--_attr_func_=1',
+            '--_attr_data_=1',
+            '--keys=1',
+            '--db.items=1',
+            '--db.port=5',
+        ])
+
+        self.assertEqual(set(cfg), {'db'})
+        self.assertEqual(dict(cfg.db), {'port': 5})
@@ -0,0 +1,276 @@
+"""
+Columnar export of many config objects, for querying leaves by path or value
+across all of them at once.
+"""
+
+import array
+import bisect
+import itertools
+import math
+import operator
+
+
+OTHER = 0
+BOOL = 1
+INT = 2
+FLOAT = 3
+STR = 4
+
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+
+
+def _path_key(path):
+    "Sort key for paths, which may mix string keys and integer indexes."
+
+    return tuple(str(key) for key in path)
+
+def _kind(value):
+    "Returns the kind code of a leaf."
+
+    if isinstance(value, bool):
+        return BOOL
+
+    elif isinstance(value, int) and _INT_MIN <= value <= _INT_MAX:
+        return INT
+
+    elif isinstance(value, float):
+        return FLOAT
+
+    elif isinstance(value, str):
+        return STR
+
+    return OTHER
+
+
+class ColumnTable:
+    """
+    Leaves of many config objects, stored one row per leaf in typed columns.
+
+    ``paths`` holds every distinct path once, sorted, and the rows are grouped
+    by path, so the rows of a path, or of all the paths under a prefix, are a
+    contiguous range. For each row, ``config`` holds the index of its config
+    object, ``path`` the index of its path, and ``kind`` one of
+    :py:data:`OTHER`, :py:data:`BOOL`, :py:data:`INT`, :py:data:`FLOAT` or
+    :py:data:`STR`. The leaf is stored in the column for its kind: ``bools``,
+    ``ints`` (int64), ``floats`` (float64, NaN elsewhere), or ``strings`` as a
+    code into the ``dictionary`` of distinct strings (-1 elsewhere). The
+    ``value`` list holds every leaf as it is, and is the only column for
+    ints that do not fit in 64 bits and for other kinds.
+
+    Every column but ``value`` is an :py:class:`array.array`, so it can be
+    used without copying through the buffer protocol, for example with
+    ``numpy.frombuffer``.
+    """
+
+    __slots__ = (
+        'paths',
+        'config',
+        'path',
+        'kind',
+        'bools',
+        'ints',
+        'floats',
+        'strings',
+        'dictionary',
+        'value',
+        '__ids',
+        '__keys',
+        '__offsets',
+    )
+
+    def __init__(self, buckets):
+        self.paths = tuple(sorted(buckets, key=_path_key))
+        self.config = array.array('q')
+        self.path = array.array('q')
+        self.kind = array.array('b')
+        self.bools = array.array('b')
+        self.ints = array.array('q')
+        self.floats = array.array('d')
+        self.strings = array.array('q')
+        self.value = []
+        self.__ids = {path: index for index, path in enumerate(self.paths)}
+        self.__keys = tuple(_path_key(path) for path in self.paths)
+        self.__offsets = array.array('q', [0])
+
+        codes = {}
+
+        for index, path in enumerate(self.paths):
+            configs, values = zip(*buckets[path])
+            kinds = [_kind(value) for value in values]
+
+            self.config.extend(configs)
+            self.path.extend([index] * len(values))
+            self.kind.extend(kinds)
+            self.bools.extend(
+                value if kind == BOOL else False
+                for kind, value in zip(kinds, values)
+            )
+            self.ints.extend(
+                value if kind == INT else 0
+                for kind, value in zip(kinds, values)
+            )
+            self.floats.extend(
+                value if kind == FLOAT else math.nan
+                for kind, value in zip(kinds, values)
+            )
+            self.strings.extend(
+                codes.setdefault(value, len(codes)) if kind == STR else -1
+                for kind, value in zip(kinds, values)
+            )
+            self.value.extend(values)
+            self.__offsets.append(len(self.value))
+
+        self.dictionary = tuple(codes)
+
+    def __len__(self):
+        "Return len(self)."
+
+        return len(self.value)
+
+    def __repr__(self):
+        "Return repr(self)."
+
+        return '<{name}: {rows} rows, {paths} paths>'.format(
+            name=type(self).__name__,
+            rows=len(self),
+            paths=len(self.paths)
+        )
+
+    def __path_range(self, prefix):
+        "Returns the range of indexes of the paths starting with the prefix."
+
+        key = _path_key(prefix)
+
+        if not key:
+            return range(len(self.paths))
+
+        lo = bisect.bisect_left(self.__keys, key)
+        hi = bisect.bisect_left(
+            self.__keys,
+            key[:-1] + (''.join([key[-1], '\0']), ),
+            lo
+        )
+        return range(lo, hi)
+
+    def rows(self, path):
+        "Returns the range of rows holding the leaves at the path."
+
+        try:
+            index = self.__ids[tuple(path)]
+
+        except KeyError:
+            return range(0)
+
+        return range(self.__offsets[index], self.__offsets[index + 1])
+
+    def prefix_rows(self, prefix):
+        "Returns the range of rows holding the leaves under the prefix."
+
+        paths = self.__path_range(prefix)
+        return range(self.__offsets[paths.start], self.__offsets[paths.stop])
+
+    def prefix(self, prefix):
+        "Returns the paths starting with the prefix."
+
+        paths = self.__path_range(prefix)
+        return self.paths[paths.start:paths.stop]
+
+    def __select(self, rows, mask, prefix):
+        "Returns the config indexes of the rows picked by the mask."
+
+        ret = itertools.compress(self.config[rows.start:rows.stop], mask)
+
+        if prefix:
+            return sorted(set(ret))
+
+        return list(ret)
+
+    def __kind_mask(self, rows, kind, column, op, other):
+        "Masks the rows of the kind whose value in the column matches."
+
+        return map(
+            operator.and_,
+            map(
+                operator.eq,
+                self.kind[rows.start:rows.stop],
+                itertools.repeat(kind)
+            ),
+            map(op, column[rows.start:rows.stop], itertools.repeat(other))
+        )
+
+    def compare(self, path, op, other, *, prefix=False):
+        """
+        Returns the indexes of the config objects with a leaf at the path
+        for which ``op(leaf, other)`` is true, or with any such leaf under the
+        path if ``prefix`` is true.
+
+        Only leaves of the kind of ``other`` are compared: bools with a bool,
+        ints and floats with an int or a float, and strings with a string.
+        Ints that do not fit in 64 bits are never compared.
+        The comparison runs over whole column slices. For strings, ``op`` is
+        run once for each distinct string, not once for each row.
+        """
+
+        rows = self.prefix_rows(path) if prefix else self.rows(path)
+
+        if isinstance(other, bool):
+            mask = self.__kind_mask(rows, BOOL, self.bools, op, other)
+
+        elif isinstance(other, (int, float)):
+            mask = map(
+                operator.or_,
+                self.__kind_mask(rows, INT, self.ints, op, other),
+                self.__kind_mask(rows, FLOAT, self.floats, op, other)
+            )
+
+        elif isinstance(other, str):
+            codes = frozenset(
+                code
+                for code, value in enumerate(self.dictionary)
+                if op(value, other)
+            )
+            mask = map(
+                codes.__contains__,
+                self.strings[rows.start:rows.stop]
+            )
+
+        else:
+            raise TypeError(
+                'Cannot compare leaves with {other!r}, use where()'.format(
+                    other=other
+                )
+            )
+
+        return self.__select(rows, mask, prefix)
+
+    def where(self, path, predicate, *, prefix=False):
+        """
+        Returns the indexes of the config objects with a leaf at the path
+        matching the predicate, or with any such leaf under the path if
+        ``prefix`` is true. The predicate is called for each row, so
+        :py:meth:`compare` is faster where it can be used.
+        """
+
+        rows = self.prefix_rows(path) if prefix else self.rows(path)
+
+        return self.__select(
+            rows,
+            map(predicate, self.value[rows.start:rows.stop]),
+            prefix
+        )
+
+
+def to_columns(configs):
+    """
+    Exports the leaves of many config objects into a :py:class:`ColumnTable`,
+    streaming each one with :py:meth:`BaseConfig.iter_flat`.
+    """
+
+    buckets = {}
+
+    for index, config in enumerate(configs):
+        for path, value in config.iter_flat():
+            buckets.setdefault(path, []).append((index, value))
+
+    return ColumnTable(buckets)
@@ -1,9 +1,8 @@
 import abc
 import builtins
 import collections.abc
-import copy
 import functools
-import gzip
+import importlib
 import itertools
 import sys
 import types
@@ -78,6 +77,58 @@ def unpack_element(elem, *, memo={}):
             
         return memo[id(self)]
 
+def importable(obj):
+    "Checks whether an object can be found again by its module and name."
+
+    qualname = getattr(obj, '__qualname__', None)
+    ret = sys.modules.get(getattr(obj, '__module__', None))
+
+    if not isinstance(qualname, str) or ret is None or '<' in qualname:
+        return False
+
+    for name in qualname.split('.'):
+        ret = getattr(ret, name, None)
+
+    return ret is obj
+
+def shared_constant(obj):
+    """
+    Checks whether an object is a singleton or interned value shared by the
+    whole program: None, a bool, a cached small int, or an interned string.
+
+    Strings are checked with ``sys._is_interned`` where it exists. Elsewhere
+    an equal copy of an identifier is interned to see whether the string
+    comes back, which checks without interning the string itself; other
+    strings are never interned implicitly, so they are not treated as shared.
+    """
+
+    if obj is None or isinstance(obj, bool):
+        return True
+
+    elif type(obj) is int:
+        return -5 <= obj <= 256
+
+    elif type(obj) is not str:
+        return False
+
+    is_interned = getattr(sys, '_is_interned', None)
+
+    if is_interned is not None:
+        return is_interned(obj)
+
+    elif not obj.isidentifier():
+        return False
+
+    return sys.intern(obj.encode('utf-8').decode('utf-8')) is obj
+
+def new_config(cls):
+    """
+    Makes an empty, uninitialized instance of the given config class, for use
+    when unpickling.
+    """
+
+    return cls.__new__(cls)
+
 
 class SingletonMeta(type):
     __slots__ = ()
@@ -113,6 +164,9 @@ class NotLoaded(metaclass=SingletonMeta):
     def __hash__(self):
         return hash(type(self).__name__)
 
+    def __reduce__(self):
+        return 'NotLoaded'
+
 
 NotLoaded = NotLoaded()
 
@@ -132,6 +186,13 @@ class ConfigItemsView(collections.abc.ItemsView):
         return ''.join([type(self).__name__, '(', repr(tuple(self)), ')'])
 
 
+MemoryReport = collections.namedtuple('MemoryReport', ['total', 'paths'])
+MemoryReport.__doc__ = """
+Result of :py:meth:`BaseConfig.memory_report`: the total size in bytes, and a
+mapping of each config object's path to the bytes it holds by itself.
+"""
+
+
 class ConfigMeta(abc.ABCMeta):
     __slots__ = ()
 
@@ -195,7 +256,7 @@ class ConfigMeta(abc.ABCMeta):
         super().__init__(name, bases, namespace)
 
 class BaseConfig(
-    collections.Mapping,
+    collections.abc.Mapping,
     metaclass=ConfigMeta,
     slots=(
         '__attr_data',
@@ -210,6 +271,8 @@ class BaseConfig(
         '_attr_func_',
         '_set_attr',
         '_reset_attr',
+        '_picklable_',
+        '_set_holders_',
         '_abc_cache',
         '_abc_negative_cache',
         '_abc_negative_cache_version',
@@ -232,7 +295,7 @@ class BaseConfig(
         """
 
         if hasattr(cls, '__factory_subclass'):
-            return super().__new__(*args, **kwargs)
+            return super().__new__(cls)
 
         else:
             new_cls_name = cls.__name__
@@ -350,6 +413,15 @@ class BaseConfig(
             }
         )()
 
+    def _set_holders_(self, data, funcs):
+        """
+        Uses already-made objects to hold the memoized data and the functions
+        to be lazily-evaluated, for classes with a fixed layout.
+        """
+
+        self.__attr_data = data
+        self.__attr_func = funcs
+
     @staticmethod
     def _simple_get_(name, self):
         "Used to read evaluated & memoized attributes."
@@ -367,7 +439,8 @@ class BaseConfig(
             type(self),
             name,
             property(
-                functools.partial(self._simple_get_, name)
+                functools.partial(self._simple_get_, name),
+                doc=getattr(type(self), name).__doc__
             )
         )
         delattr(self._attr_func_, name)
@@ -397,7 +470,8 @@ class BaseConfig(
             type(self),
             name,
             property(
-                functools.partial(self._simple_get_, name)
+                functools.partial(self._simple_get_, name),
+                doc=getattr(type(self), name).__doc__
             )
         )
 
@@ -407,7 +481,13 @@ class BaseConfig(
         if doc is None:
             doc = 'The {name} attribute.'.format(name=name)
 
-        if not hasattr(self._attr_func_, name):
+        if hasattr(self._attr_data_, name):
+            attr_prop = property(
+                functools.partial(self._simple_get_, name),
+                doc=doc
+            )
+
+        elif not hasattr(self._attr_func_, name):
             attr_prop = property(
                 functools.partial(self._setable_get_, name),
                 functools.partial(self._setable_set_, name),
@@ -557,7 +637,11 @@ class BaseConfig(
     def __sizeof__(self):
         "Return sys.getsizeof(self)."
 
-        return sys.getsizeof(vars(self))
+        return (
+            object.__sizeof__(self) +
+            sys.getsizeof(self._attr_data_) +
+            sys.getsizeof(self._attr_func_)
+        )
 
     def __len__(self):
         "Return len(self)."
@@ -605,11 +689,11 @@ class BaseConfig(
     def copy(self):
         "D.copy() -> a shallow copy of D"
 
-        return copy.copy(self)
+        return self.__copy__()
 
     def __copy__(self):
         "For use with the :py:func:`copy.copy` function."
-        return copy.copy(dict(self.__gen_items()))
+        return dict(self.__gen_items())
 
     def get(self, key, default=None):
         "D.get(k[,d]) -> D[k] if k in D, else d.  d defaults to None."
@@ -633,27 +717,217 @@ class BaseConfig(
 
         return ret
 
+    @staticmethod
+    def _picklable_(func):
+        """
+        Checks whether a lazy-loading function can be pickled as-is, without
+        serializing it: it must be a function or class importable by name,
+        or a method or :py:func:`functools.partial` of one, where every
+        callable bound by the partial passes the same check.
+        """
+
+        if isinstance(func, functools.partial):
+            return BaseConfig._picklable_(func.func) and all(
+                BaseConfig._picklable_(value)
+                for value in itertools.chain(func.args, func.keywords.values())
+                if callable(value)
+            )
+
+        elif isinstance(func, types.MethodType):
+            return BaseConfig._picklable_(func.__func__)
+
+        return importable(func)
+
+    def iter_flat(self):
+        """
+        Generates ``(path, value)`` for every leaf of the config tree, depth
+        first, without building any intermediate dicts. Nested config objects
+        and tuples are walked into, adding keys and indexes to the path;
+        anything else is a leaf. Items are read through
+        :py:class:`ConfigItemsView`, so keys such as ``items`` that shadow the
+        mapping methods are walked like any other key.
+        """
+
+        stack = [((), iter(ConfigItemsView(self)))]
+
+        while stack:
+            path, items = stack[-1]
+
+            for key, value in items:
+                if isinstance(value, BaseConfig):
+                    stack.append(
+                        (path + (key, ), iter(ConfigItemsView(value)))
+                    )
+                    break
+
+                elif isinstance(value, tuple):
+                    stack.append((path + (key, ), enumerate(value)))
+                    break
+
+                yield path + (key, ), value
+
+            else:
+                stack.pop()
+
+    def memory_report(self):
+        """
+        Measures the memory used by the config tree, and returns a
+        :py:class:`MemoryReport`.
+
+        Every config object in the tree is counted along with its generated
+        types, its memoized values and its pending loading functions. Each
+        object is counted once, under the first path it is found at when the
+        tree is walked depth first in key order, so shared objects are not
+        counted twice. Functions made for the tree, such as lambdas, are
+        counted with the cells of their closures and their default values, but
+        not their code or globals. Modules, classes and functions importable
+        by name, and the constants checked by :py:func:`shared_constant`, are
+        shared by the whole program and are left out. Nothing is loaded while
+        measuring.
+        """
+
+        import gc
+
+        paths = {}
+        seen = set()
+        owned = set()
+        stack = [((), (), self)]
+
+        while stack:
+            owner, path, obj = stack.pop()
+
+            if id(obj) in seen or shared_constant(obj) or isinstance(
+                obj,
+                types.ModuleType
+            ) or (
+                isinstance(obj, type) and id(obj) not in owned
+            ) or (
+                isinstance(
+                    obj,
+                    (types.FunctionType, types.BuiltinFunctionType)
+                ) and importable(obj)
+            ):
+                continue
+
+            seen.add(id(obj))
+
+            if isinstance(obj, BaseConfig):
+                owner = path
+                data, funcs = obj._attr_data_, obj._attr_func_
+                seen.update({id(data), id(funcs)})
+                owned.update({id(type(obj)), id(type(data)), id(type(funcs))})
+                stack.extend(
+                    (owner, path, type_)
+                    for type_ in (type(obj), type(data), type(funcs))
+                )
+                stack.extend(sorted(
+                    (
+                        (owner, path + (key, ), getattr(holder, key))
+                        for holder in (data, funcs)
+                        for key in holder.__slots__
+                        if hasattr(holder, key)
+                    ),
+                    key=lambda item: item[1],
+                    reverse=True
+                ))
+
+            elif isinstance(obj, (tuple, list, set, frozenset)):
+                stack.extend(
+                    (owner, path + (index, ), value)
+                    for index, value in enumerate(obj)
+                )
+
+            elif isinstance(obj, dict):
+                stack.extend(
+                    (owner, path + (key, ), value)
+                    for key, value in obj.items()
+                )
+                stack.extend((owner, path, key) for key in obj)
+
+            elif isinstance(obj, types.FunctionType):
+                stack.extend(
+                    (owner, path, value)
+                    for value in (
+                        obj.__closure__,
+                        obj.__defaults__,
+                        obj.__kwdefaults__,
+                    )
+                    if value is not None
+                )
+
+            else:
+                stack.extend(
+                    (owner, path, value)
+                    for value in gc.get_referents(obj)
+                )
+
+            paths[owner] = paths.get(owner, 0) + sys.getsizeof(obj)
+
+        return MemoryReport(sum(paths.values()), paths)
+
     def __getstate__(self):
+        """
+        Returns the layout of the config object, for use with :py:mod:`pickle`.
+
+        Memoized values are stored as they are, so they are not re-parsed when
+        unpickled. Attributes that have not been loaded yet stay lazy if their
+        loading function can be pickled, otherwise they are loaded first.
+        """
+
+        slots = tuple(
+            set(self._attr_data_.__slots__) | set(self._attr_func_.__slots__)
+        )
+        [
+            getattr(self, key)
+            for key in slots
+            if hasattr(self._attr_func_, key) and not self._picklable_(
+                getattr(self._attr_func_, key)
+            )
+        ]
+        cls = type(self)
+
         return {
-            key: value
-            for key, value in self.__gen_items()
-            if value is not NotLoaded
+            'slots': slots,
+            'data': {
+                key: getattr(self._attr_data_, key)
+                for key in slots
+                if hasattr(self._attr_data_, key)
+            },
+            'funcs': {
+                key: getattr(self._attr_func_, key)
+                for key in slots
+                if hasattr(self._attr_func_, key)
+            },
+            'docs': {
+                key: getattr(cls, key).__doc__
+                for key in slots
+                if getattr(cls, key).__doc__ != (
+                    'The {name} attribute.'.format(name=key)
+                )
+            },
         }
 
     def __setstate__(self, state):
-        for key, value in state.items():
-            setattr(self._attr_data_, key)
-            setattr(
-                type(self),
-                key,
-                property(functools.partial(self._simple_get_, key))
-            )
-
-            try:
-                delattr(self._attr_func_, key)
+        """
+        Rebuilds the config object from the layout made by
+        :py:meth:`__getstate__`, without running :py:meth:`__init__`.
+        """
 
-            except AttributeError:
-                pass
+        self._attr_data_ = state['slots']
+        self._attr_func_ = state['slots']
+
+        [
+            setattr(self._attr_data_, key, value)
+            for key, value in state['data'].items()
+        ]
+        [
+            setattr(self._attr_func_, key, value)
+            for key, value in state['funcs'].items()
+        ]
+        [
+            self._set_attr(key, state['docs'].get(key))
+            for key in state['slots']
+        ]
 
     @abc.abstractmethod
     def __reduce__(self):
@@ -676,7 +950,7 @@ class DictConfig(BaseConfig):
         )
 
     def __reduce__(self):
-        return (DictConfig, (copy.deepcopy(self), ), self.__getstate__())
+        return (new_config, (DictConfig, ), self.__getstate__())
 
             
 class MainConfig(BaseConfig):
@@ -692,31 +966,83 @@ class MainConfig(BaseConfig):
                     'name': 'Base',
                     'func': lambda: BaseConfig,
                     'doc': BaseConfig.__doc__,
-                    'preload': True
                 },
                 
                 {
                     'name': 'Dict',
                     'func': lambda: DictConfig,
                     'doc': DictConfig.__doc__,
-                    'preload': True
                 },
                 
                 {
                     'name': 'to_config',
                     'func': lambda: parse_element,
                     'doc': parse_element.__doc__,
-                    'preload': True
                 },
                 
                 {
                     'name': 'from_config',
                     'func': lambda: unpack_element,
                     'doc': unpack_element.__doc__,
-                    'preload': True
+                },
+                
+                {
+                    'name': 'Schema',
+                    'func': lambda: importlib.import_module(
+                        'xdh._schema'
+                    ).Schema,
+                    'doc': 'Compiles a schema for loading typed configs.',
+                },
+                
+                {
+                    'name': 'Field',
+                    'func': lambda: importlib.import_module(
+                        'xdh._schema'
+                    ).Field,
+                    'doc': 'Describes a single field of a schema.',
+                },
+                
+                {
+                    'name': 'SchemaError',
+                    'func': lambda: importlib.import_module(
+                        'xdh._schema'
+                    ).SchemaError,
+                    'doc': 'Raised when a source does not match a schema.',
+                },
+                
+                {
+                    'name': 'from_flat',
+                    'func': lambda: importlib.import_module(
+                        'xdh._sources'
+                    ).from_flat,
+                    'doc': 'Builds a config object from (name, value) pairs.',
+                },
+                
+                {
+                    'name': 'from_environ',
+                    'func': lambda: importlib.import_module(
+                        'xdh._sources'
+                    ).from_environ,
+                    'doc': 'Builds a config object from the environment.',
+                },
+                
+                {
+                    'name': 'from_argv',
+                    'func': lambda: importlib.import_module(
+                        'xdh._sources'
+                    ).from_argv,
+                    'doc': 'Builds a config object from command-line options.',
+                },
+                
+                {
+                    'name': 'to_columns',
+                    'func': lambda: importlib.import_module(
+                        'xdh._columns'
+                    ).to_columns,
+                    'doc': 'Exports many config objects into columnar arrays.',
                 },
             ]
         )
         
     def __reduce__(self):
-        return (MainConfig, (), self.__getstate__())
\ No newline at end of file
+        return (new_config, (MainConfig, ), self.__getstate__())
\ No newline at end of file
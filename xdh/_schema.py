@@ -0,0 +1,666 @@
+"""
+Schema-compiled config objects, which are validated and coerced once when
+they are loaded.
+"""
+
+import builtins
+import collections.abc
+import datetime
+import enum
+import functools
+import re
+import weakref
+
+from xdh._config import (
+    BaseConfig,
+    ConfigItemsView,
+    NotLoaded,
+    parse_element,
+)
+
+
+_SCHEMAS = weakref.WeakValueDictionary()
+
+INT_LITERAL = re.compile(r'-?(?:0|[1-9][0-9]*)')
+FLOAT_LITERAL = re.compile(
+    r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+(?:[eE][-+]?[0-9]+)?|[eE][-+]?[0-9]+)'
+)
+
+_TRUE = frozenset({'1', 'true', 'yes', 'on'})
+_FALSE = frozenset({'0', 'false', 'no', 'off'})
+
+_DURATION = re.compile(
+    r'\s*(?:\d+(?:\.\d*)?\s*(?:us|ms|s|m|h|d|w)\s*)+'
+)
+_DURATION_PART = re.compile(r'(\d+(?:\.\d*)?)\s*(us|ms|s|m|h|d|w)')
+_DURATION_UNITS = {
+    'us': 'microseconds',
+    'ms': 'milliseconds',
+    's': 'seconds',
+    'm': 'minutes',
+    'h': 'hours',
+    'd': 'days',
+    'w': 'weeks',
+}
+
+
+def coerce_bool(value):
+    "Coerces a bool, 0/1, or a string such as 'yes' or 'off' into a bool."
+
+    if isinstance(value, bool):
+        return value
+
+    elif isinstance(value, int) and value in (0, 1):
+        return bool(value)
+
+    elif isinstance(value, str) and value.strip().lower() in _TRUE:
+        return True
+
+    elif isinstance(value, str) and value.strip().lower() in _FALSE:
+        return False
+
+    raise ValueError('expected a boolean, got {value!r}'.format(value=value))
+
+def _is_decimal(value):
+    """
+    Checks whether a string, without surrounding whitespace, is a canonical
+    decimal literal. Literals such as ``1_000``, ``0022``, ``inf`` or ones
+    with non-ASCII digits are not, the same as in
+    :py:func:`xdh._sources.coerce_scalar`.
+    """
+
+    value = value.strip()
+    return bool(INT_LITERAL.fullmatch(value) or FLOAT_LITERAL.fullmatch(value))
+
+def coerce_int(value):
+    """
+    Coerces an int, an integral float, or a string holding a canonical
+    integer literal into an int.
+    """
+
+    if isinstance(value, bool):
+        pass
+
+    elif isinstance(value, int):
+        return value
+
+    elif isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    elif isinstance(value, str) and INT_LITERAL.fullmatch(value.strip()):
+        return int(value)
+
+    raise ValueError('expected an integer, got {value!r}'.format(value=value))
+
+def coerce_float(value):
+    """
+    Coerces an int, a float, or a string holding a canonical decimal literal
+    into a float.
+    """
+
+    if isinstance(value, bool):
+        pass
+
+    elif isinstance(value, (int, float)):
+        return float(value)
+
+    elif isinstance(value, str) and _is_decimal(value):
+        return float(value)
+
+    raise ValueError('expected a number, got {value!r}'.format(value=value))
+
+def coerce_str(value):
+    "Accepts only strings."
+
+    if isinstance(value, str):
+        return value
+
+    raise TypeError('expected a string, got {value!r}'.format(value=value))
+
+def coerce_timedelta(value):
+    """
+    Coerces a timedelta, a number of seconds, a string holding a canonical
+    decimal literal of seconds, or a string such as '1h30m' or '250ms' into
+    a :py:class:`datetime.timedelta`.
+    """
+
+    if isinstance(value, datetime.timedelta):
+        return value
+
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.timedelta(seconds=value)
+
+    elif isinstance(value, str):
+        if _is_decimal(value):
+            return datetime.timedelta(seconds=float(value))
+
+        elif _DURATION.fullmatch(value):
+            return sum(
+                (
+                    datetime.timedelta(
+                        **{_DURATION_UNITS[unit]: float(amount)}
+                    )
+                    for amount, unit in _DURATION_PART.findall(value)
+                ),
+                datetime.timedelta()
+            )
+
+    raise ValueError('expected a duration, got {value!r}'.format(value=value))
+
+def coerce_enum(enum_type, value):
+    "Coerces a member, a member's value, or a member's name into an enum."
+
+    if isinstance(value, enum_type):
+        return value
+
+    try:
+        return enum_type(value)
+
+    except ValueError:
+        pass
+
+    try:
+        return enum_type[value]
+
+    except (KeyError, TypeError):
+        raise ValueError(
+            'expected one of {names}, got {value!r}'.format(
+                names=', '.join(enum_type.__members__),
+                value=value
+            )
+        )
+
+def coerce_type(type_, value):
+    "Accepts instances of the type, otherwise tries to convert by calling it."
+
+    if isinstance(value, type_):
+        return value
+
+    return type_(value)
+
+
+COERCERS = {
+    bool: coerce_bool,
+    int: coerce_int,
+    float: coerce_float,
+    str: coerce_str,
+    datetime.timedelta: coerce_timedelta,
+}
+
+
+def _coerce_leaf(func, value, path, errors):
+    "Coerces a single value, recording an error instead of raising one."
+
+    try:
+        return func(value)
+
+    except (TypeError, ValueError) as exc:
+        errors.append((path, str(exc)))
+        return NotLoaded
+
+    except Exception as exc:
+        errors.append((path, '{name}: {exc}'.format(
+            name=type(exc).__name__,
+            exc=exc
+        )))
+        return NotLoaded
+
+def _coerce_parsed(func, value):
+    "Converts a single value, making the result read-only."
+
+    return parse_element(func(value))
+
+def _coerce_sequence(coerce, value, path, errors):
+    "Coerces every item of a sequence, making a tuple."
+
+    isinstance = builtins.isinstance
+
+    if isinstance(value, (str, bytes, bytearray)) or not isinstance(
+        value,
+        (collections.abc.Sequence, collections.abc.Set)
+    ):
+        errors.append(
+            (path, 'expected a sequence, got {value!r}'.format(value=value))
+        )
+        return NotLoaded
+
+    return tuple(
+        coerce(item, path + (index, ), errors)
+        for index, item in enumerate(value)
+    )
+
+def _load_field(coerce, value, path):
+    "Used to lazily validate & coerce a single field."
+
+    errors = []
+    ret = coerce(value, path, errors)
+
+    if errors:
+        raise SchemaError(errors)
+
+    return ret
+
+def _freeze_default(value):
+    """
+    Makes a hashable version of a parsed default, tagged with the type of
+    every value in it, so that defaults which only compare equal, such as
+    ``(1, )`` and ``(True, )``, are told apart.
+    """
+
+    isinstance = builtins.isinstance
+
+    if isinstance(value, BaseConfig):
+        ret = (type(value), ) + tuple(
+            (key, _freeze_default(item))
+            for key, item in ConfigItemsView(value)
+        )
+
+    elif isinstance(value, tuple):
+        ret = (tuple, ) + tuple(_freeze_default(item) for item in value)
+
+    elif isinstance(value, frozenset):
+        ret = (frozenset, frozenset(_freeze_default(item) for item in value))
+
+    elif isinstance(value, float):
+        ret = (float, repr(value))
+
+    else:
+        ret = (type(value), value)
+
+    return ret
+
+def freeze_spec(spec):
+    """
+    Makes a hashable version of a spec, used to find an already-compiled
+    :py:class:`Schema`. Raises :py:class:`TypeError` if part of the spec
+    cannot be hashed.
+    """
+
+    isinstance = builtins.isinstance
+
+    if isinstance(spec, Field):
+        ret = (
+            Field,
+            freeze_spec(spec.kind),
+            _freeze_default(parse_element(spec.default)),
+            spec.doc,
+            spec.lazy,
+        )
+
+    elif isinstance(spec, collections.abc.Mapping):
+        ret = (dict, ) + tuple(
+            (key, freeze_spec(kind))
+            for key, kind in sorted(spec.items())
+        )
+
+    elif isinstance(spec, (list, tuple)):
+        ret = (list, ) + tuple(freeze_spec(kind) for kind in spec)
+
+    else:
+        ret = spec
+
+    hash(ret)
+    return ret
+
+def compile_kind(kind, name):
+    """
+    Compiles the kind of a field into a function taking the value, its path,
+    and a list to record errors in, and returning the coerced value.
+    """
+
+    isinstance = builtins.isinstance
+
+    if isinstance(kind, Schema):
+        ret = kind._coerce_
+
+    elif isinstance(kind, collections.abc.Mapping):
+        ret = Schema(kind, name)._coerce_
+
+    elif isinstance(kind, (list, tuple)) and len(kind) == 1:
+        ret = functools.partial(_coerce_sequence, compile_kind(kind[0], name))
+
+    elif isinstance(kind, type) and kind in COERCERS:
+        ret = functools.partial(_coerce_leaf, COERCERS[kind])
+
+    elif isinstance(kind, type) and issubclass(kind, enum.Enum):
+        ret = functools.partial(
+            _coerce_leaf,
+            functools.partial(coerce_enum, kind)
+        )
+
+    elif isinstance(kind, type):
+        ret = functools.partial(
+            _coerce_leaf,
+            functools.partial(
+                _coerce_parsed,
+                functools.partial(coerce_type, kind)
+            )
+        )
+
+    elif callable(kind):
+        ret = functools.partial(
+            _coerce_leaf,
+            functools.partial(_coerce_parsed, kind)
+        )
+
+    else:
+        raise TypeError(
+            "Cannot use {kind!r} as the kind of the '{name}' field".format(
+                kind=kind,
+                name=name
+            )
+        )
+
+    return ret
+
+
+class SchemaError(ValueError):
+    """
+    Raised when a source does not match a schema. The ``errors`` attribute
+    holds a ``(path, message)`` pair for every bad path that was found.
+    """
+
+    def __init__(self, errors):
+        self.errors = tuple(errors)
+        super().__init__(
+            '\n'.join(
+                '{path}: {message}'.format(
+                    path='.'.join(str(key) for key in path) or '<root>',
+                    message=message
+                )
+                for path, message in self.errors
+            )
+        )
+
+    def __reduce__(self):
+        return (SchemaError, (self.errors, ))
+
+
+class Field:
+    """
+    Describes a single field of a schema. A field with a default is optional,
+    and the default is used as it is. A lazy field is only validated & coerced
+    when it is first read.
+    """
+
+    __slots__ = ('kind', 'default', 'doc', 'lazy')
+
+    def __init__(self, kind, *, default=NotLoaded, doc=None, lazy=False):
+        self.kind = kind
+        self.default = default
+        self.doc = doc
+        self.lazy = lazy
+
+    def __repr__(self):
+        "Return repr(self)."
+
+        return '{name}({kind!r}, default={default!r}, lazy={lazy!r})'.format(
+            name=type(self).__name__,
+            kind=self.kind,
+            default=self.default,
+            lazy=self.lazy
+        )
+
+    def __reduce__(self):
+        return (
+            functools.partial(
+                Field,
+                default=self.default,
+                doc=self.doc,
+                lazy=self.lazy
+            ),
+            (self.kind, )
+        )
+
+
+class SchemaConfig(
+    BaseConfig,
+    bad_names={
+        '_schema_',
+        '_schema_get_',
+    }
+):
+    """
+    Base class of the config classes compiled by :py:class:`Schema`. Each
+    schema makes a single class with fixed slots, which is shared by every
+    config object loaded with it.
+    """
+
+    @staticmethod
+    def _schema_get_(name, self):
+        "Used to read a field, validating & memoizing lazy fields when read."
+
+        try:
+            return getattr(self._attr_data_, name)
+
+        except AttributeError:
+            func = getattr(self._attr_func_, name)
+            ret = func()
+            setattr(self._attr_data_, name, ret)
+            delattr(self._attr_func_, name)
+            return ret
+
+    def _reset_attr(self, name, func=None, doc=None, preload=False):
+        raise TypeError(
+            "'{name}' object has a fixed layout".format(
+                name=type(self).__name__
+            )
+        )
+
+    def __reduce__(self):
+        return (
+            self._schema_._rebuild_,
+            (
+                {
+                    key: getattr(self._attr_data_, key)
+                    for key in self._attr_data_.__slots__
+                    if hasattr(self._attr_data_, key)
+                },
+                {
+                    key: getattr(self._attr_func_, key)
+                    for key in self._attr_func_.__slots__
+                    if hasattr(self._attr_func_, key)
+                },
+            )
+        )
+
+
+class Schema:
+    """
+    Compiles a schema once into a plan used to validate & coerce any number
+    of sources.
+
+    The spec is a mapping of field names to their kinds. A kind is a type
+    (``bool``, ``int``, ``float``, ``str``, :py:class:`datetime.timedelta`,
+    an :py:class:`enum.Enum`, or any other type to convert by calling it), a
+    callable doing the conversion, a nested mapping or :py:class:`Schema`,
+    a one-item list holding the kind of every item of a sequence, or a
+    :py:class:`Field` wrapping any of these.
+    """
+
+    __slots__ = (
+        '__spec',
+        '__name',
+        '__fields',
+        '__names',
+        '__types',
+        '__weakref__',
+    )
+
+    def __new__(cls, spec, name='SchemaConfig'):
+        """
+        Returns the schema already compiled in this process for the same
+        name and spec if there is one, so that a schema is compiled once per
+        process, even when it is unpickled many times. Specs that cannot be
+        hashed are compiled every time.
+        """
+
+        try:
+            key = (name, freeze_spec(spec))
+
+        except TypeError:
+            key = None
+
+        try:
+            return _SCHEMAS[key]
+
+        except (KeyError, TypeError):
+            pass
+
+        self = super().__new__(cls)
+        self._compile_(spec, name)
+
+        if key is not None:
+            _SCHEMAS[key] = self
+
+        return self
+
+    def _compile_(self, spec, name):
+        "Compiles the spec into the fields and the config class."
+
+        fields = []
+
+        for key, kind in sorted(spec.items()):
+            field = kind if isinstance(kind, Field) else Field(kind)
+            fields.append((
+                key,
+                compile_kind(field.kind, '.'.join([name, key])),
+                parse_element(field.default),
+                field.lazy,
+                (
+                    field.doc
+                    if field.doc is not None
+                    else 'The {name} attribute.'.format(name=key)
+                ),
+            ))
+
+        self.__spec = spec
+        self.__name = name
+        self.__fields = tuple(fields)
+        self.__names = frozenset(key for key, *_ in fields)
+
+        data_type = type(
+            ''.join([name, 'Data']),
+            (),
+            {
+                '__module__': __name__,
+                '__slots__': tuple(key for key, *_ in fields)
+            }
+        )
+        func_type = type(
+            ''.join([name, 'Funcs']),
+            (),
+            {
+                '__module__': __name__,
+                '__slots__': tuple(
+                    key
+                    for key, coerce, default, lazy, doc in fields
+                    if lazy
+                )
+            }
+        )
+        namespace = {
+            key: property(
+                functools.partial(SchemaConfig._schema_get_, key),
+                doc=doc
+            )
+            for key, coerce, default, lazy, doc in fields
+        }
+        namespace.update({
+            '__slots__': (),
+            '__module__': __name__,
+            '__doc__': SchemaConfig.__doc__,
+            '__factory_subclass': True,
+            '_schema_': self,
+        })
+        config_type = type(name, (SchemaConfig, ), namespace)
+        self.__types = (config_type, data_type, func_type)
+
+    def __repr__(self):
+        "Return repr(self)."
+
+        return '{name}({spec!r}, {config!r})'.format(
+            name=type(self).__name__,
+            spec=self.__spec,
+            config=self.__name
+        )
+
+    def __reduce__(self):
+        return (Schema, (self.__spec, self.__name))
+
+    def _coerce_(self, source, path, errors):
+        "Validates & coerces a source, recording every error found."
+
+        if not isinstance(source, collections.abc.Mapping):
+            errors.append(
+                (path, 'expected a mapping, got {value!r}'.format(
+                    value=source
+                ))
+            )
+            return NotLoaded
+
+        errors.extend(
+            (path + (key, ), 'unexpected field')
+            for key in sorted(set(source) - self.__names, key=str)
+        )
+
+        config_type, data_type, func_type = self.__types
+        data = data_type()
+        funcs = func_type()
+
+        for key, coerce, default, lazy, doc in self.__fields:
+            if key not in source:
+                if default is NotLoaded:
+                    errors.append((path + (key, ), 'missing field'))
+
+                else:
+                    setattr(data, key, default)
+
+            elif lazy:
+                setattr(
+                    funcs,
+                    key,
+                    functools.partial(
+                        _load_field,
+                        coerce,
+                        source[key],
+                        path + (key, )
+                    )
+                )
+
+            else:
+                setattr(data, key, coerce(source[key], path + (key, ), errors))
+
+        ret = config_type.__new__(config_type)
+        ret._set_holders_(data, funcs)
+        return ret
+
+    def _rebuild_(self, data, funcs):
+        "Rebuilds a config object without validating it again, for pickle."
+
+        config_type, data_type, func_type = self.__types
+        holders = (data_type(), func_type())
+        [
+            setattr(holder, key, value)
+            for holder, values in zip(holders, (data, funcs))
+            for key, value in values.items()
+        ]
+
+        ret = config_type.__new__(config_type)
+        ret._set_holders_(*holders)
+        return ret
+
+    def load(self, source):
+        """
+        Validates & coerces the source, returning a config object. Raises
+        :py:class:`SchemaError` listing every bad path if it does not match
+        the schema.
+        """
+
+        errors = []
+        ret = self._coerce_(source, (), errors)
+
+        if errors:
+            raise SchemaError(errors)
+
+        return ret
@@ -0,0 +1,249 @@
+"""
+Config objects built from flat namespaces, such as environment variables and
+command-line arguments.
+"""
+
+import bisect
+import functools
+import os
+import sys
+
+from xdh._config import BaseConfig, new_config
+from xdh._schema import FLOAT_LITERAL, INT_LITERAL
+
+
+def coerce_scalar(value):
+    """
+    Turns a raw string into a bool, int or float where it is written as one.
+    Only ``true``/``false`` and canonical decimal literals are converted, so
+    values such as ``0022``, ``1_000``, ``inf`` or `` 5`` stay strings.
+    """
+
+    lowered = value.lower()
+
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+
+    elif INT_LITERAL.fullmatch(value):
+        return int(value)
+
+    elif FLOAT_LITERAL.fullmatch(value):
+        return float(value)
+
+    return value
+
+def _good_part(part, delimiter):
+    """
+    Checks whether a name part can be used as a config key: it must be an
+    identifier, must not start with an underscore or start or end with a
+    character of the delimiter, and must not clash with an attribute of
+    :py:class:`FlatConfig` such as ``keys``.
+    """
+
+    return (
+        part.isidentifier() and
+        not part.startswith('_') and
+        part[0] not in delimiter and
+        part[-1] not in delimiter and
+        not hasattr(FlatConfig, part)
+    )
+
+def _after(prefix):
+    "Returns the first string sorting after every string starting with prefix."
+
+    return ''.join([prefix[:-1], chr(ord(prefix[-1]) + 1)])
+
+
+class FlatIndex:
+    """
+    Sorted index of a flat namespace, used to find the names under a prefix
+    with a binary search instead of scanning every name.
+    """
+
+    __slots__ = ('names', 'values', 'delimiter')
+
+    def __init__(self, names, values, delimiter):
+        self.names = names
+        self.values = values
+        self.delimiter = delimiter
+
+    @classmethod
+    def from_items(cls, items, delimiter):
+        """
+        Builds the index from ``(name, value)`` pairs, where later pairs win.
+        Names with parts that are not identifiers, including empty parts,
+        parts starting with an underscore, parts starting or ending with a
+        character of the delimiter, and parts clashing with config
+        attributes, are left out, so that splitting a name on the delimiter
+        and walking the sorted names by prefix always agree.
+        """
+
+        names, values = tuple(
+            zip(*sorted(
+                (name, value)
+                for name, value in dict(items).items()
+                if all(
+                    _good_part(part, delimiter)
+                    for part in name.split(delimiter)
+                )
+            ))
+        ) or ((), ())
+        return cls(names, values, delimiter)
+
+    def __reduce__(self):
+        return (FlatIndex, (self.names, self.values, self.delimiter))
+
+    def children(self, prefix):
+        """
+        Generates ``(name, value, branch)`` for the names directly under the
+        prefix. A leaf has its raw value and a branch of None, a branch has a
+        value of None and the prefix of the names under it. A name that is
+        both a leaf and a branch is treated as a branch.
+        """
+
+        names = self.names
+        lo = bisect.bisect_left(names, prefix) if prefix else 0
+        hi = (
+            bisect.bisect_left(names, _after(prefix))
+            if prefix
+            else len(names)
+        )
+        skips = {}
+
+        while lo < hi:
+            if lo in skips:
+                lo = skips.pop(lo)
+                continue
+
+            name = names[lo][len(prefix):].partition(self.delimiter)[0]
+            branch = ''.join([prefix, name, self.delimiter])
+            branch_lo = bisect.bisect_left(names, branch, lo, hi)
+            branch_hi = bisect.bisect_left(
+                names,
+                _after(branch),
+                branch_lo,
+                hi
+            )
+
+            if branch_lo < branch_hi:
+                yield name, None, branch
+
+            else:
+                yield name, self.values[lo], None
+
+            if branch_lo == lo:
+                lo = branch_hi
+
+            else:
+                if branch_lo < branch_hi:
+                    skips[branch_lo] = branch_hi
+
+                lo += 1
+
+
+class FlatConfig(BaseConfig):
+    """
+    Config object built from a :py:class:`FlatIndex`. Branches are only built
+    when first read, and leaves are only coerced when first read.
+    """
+
+    def __init__(self, index, prefix='', coerce=coerce_scalar):
+        super().__init__(
+            attrs=[
+                {
+                    'name': name,
+                    'func': (
+                        functools.partial(coerce, value)
+                        if branch is None
+                        else functools.partial(
+                            FlatConfig,
+                            index,
+                            branch,
+                            coerce
+                        )
+                    ),
+                }
+                for name, value, branch in index.children(prefix)
+            ]
+        )
+
+    def __reduce__(self):
+        return (new_config, (FlatConfig, ), self.__getstate__())
+
+
+def from_flat(items, *, prefix='', delimiter='__', coerce=coerce_scalar,
+              lower=True):
+    """
+    Builds a config object from ``(name, value)`` pairs whose names start
+    with the prefix, splitting the rest of each name on the delimiter to make
+    nested config objects. Names are lowercased unless ``lower`` is False,
+    and names with parts that are not identifiers, that start with an
+    underscore or that clash with config attributes are left out. Values are
+    passed to ``coerce`` when first read; use ``coerce=str`` to keep the raw
+    strings, for example when loading the result with a schema.
+    """
+
+    start = len(prefix)
+    items = (
+        (name[start:], value)
+        for name, value in items
+        if name.startswith(prefix)
+    )
+
+    if lower:
+        items = ((name.lower(), value) for name, value in items)
+
+    index = FlatIndex.from_items(items, delimiter)
+    return FlatConfig(index, '', coerce)
+
+def from_environ(prefix, *, environ=None, delimiter='__',
+                 coerce=coerce_scalar):
+    """
+    Builds a config object from the environment variables named with the
+    prefix, so ``APP__DB__POOL__SIZE`` is read as ``db.pool.size`` with a
+    prefix of ``'APP'``. Uses :py:data:`os.environ` unless another mapping
+    is given.
+    """
+
+    if environ is None:
+        environ = os.environ
+
+    return from_flat(
+        environ.items(),
+        prefix=''.join([prefix, delimiter]),
+        delimiter=delimiter,
+        coerce=coerce
+    )
+
+def parse_argv(argv):
+    """
+    Generates ``(name, value)`` for the options in a list of command-line
+    arguments. Options are given as ``--name=value``, or as ``--name`` for a
+    value of ``'true'``, and dashes in names are read as underscores.
+    Positional arguments are skipped, and nothing after ``--`` is read.
+    """
+
+    for arg in argv:
+        if arg == '--':
+            break
+
+        elif arg.startswith('--'):
+            name, sep, value = arg[2:].partition('=')
+            yield name.replace('-', '_'), value if sep else 'true'
+
+def from_argv(argv=None, *, delimiter='.', coerce=coerce_scalar):
+    """
+    Builds a config object from command-line options, so
+    ``--db.pool.size=10`` is read as ``db.pool.size``. Uses ``sys.argv[1:]``
+    unless another list is given.
+    """
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    return from_flat(
+        parse_argv(argv),
+        delimiter=delimiter,
+        coerce=coerce,
+        lower=False
+    )